@@ -1,53 +1,104 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .account import InvisiaAccount, normalize_email
 from .api import InvisiaAPI
+from .capabilities import InvisiaCapabilities, async_register_reprobe_service
 from .coordinator import InvisiaCoordinator, InvisiaIds
+from .export import async_register_export_service
 from .const import (
     DOMAIN,
     PLATFORMS,
     CONF_EMAIL,
     CONF_PASSWORD,
     CONF_INSTALLATION_ID,
+    CONF_INSTALLATIONS,
     CONF_RFID_ID,
     CONF_USER_ID,
     CONF_CHARGING_STATION_ID,
+    SITE_KEYS,
+    SERVICE_EXPORT,
+    SERVICE_REPROBE,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _site_ids(site: dict[str, Any]) -> InvisiaIds:
+    return InvisiaIds(
+        installation_id=int(site[CONF_INSTALLATION_ID]),
+        rfid_id=int(site[CONF_RFID_ID]),
+        user_id=int(site[CONF_USER_ID]) if site.get(CONF_USER_ID) else None,
+        charging_station_id=int(site[CONF_CHARGING_STATION_ID]) if site.get(CONF_CHARGING_STATION_ID) else None,
+    )
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     session = async_get_clientsession(hass)
+    sites = entry.data[CONF_INSTALLATIONS]
 
+    # One login for the whole account; the installation header is per request.
     api = InvisiaAPI(
         email=entry.data[CONF_EMAIL],
         password=entry.data[CONF_PASSWORD],
-        installation_id=int(entry.data[CONF_INSTALLATION_ID]),
+        installation_id=int(sites[0][CONF_INSTALLATION_ID]),
         session=session,
     )
 
-    ids = InvisiaIds(
-        installation_id=int(entry.data[CONF_INSTALLATION_ID]),
-        rfid_id=int(entry.data[CONF_RFID_ID]),
-        user_id=int(entry.data[CONF_USER_ID]) if entry.data.get(CONF_USER_ID) else None,
-        charging_station_id=int(entry.data[CONF_CHARGING_STATION_ID]) if entry.data.get(CONF_CHARGING_STATION_ID) else None,
-    )
+    capabilities = InvisiaCapabilities(hass, entry.entry_id)
+    await capabilities.async_load()
+
+    # The shared login is the only thing every site depends on.
+    try:
+        await api.login()
+    except Exception as err:
+        raise ConfigEntryNotReady(f"Invisia login failed: {err}") from err
 
-    coordinator = InvisiaCoordinator(hass=hass, api=api, ids=ids)
-    await coordinator.async_config_entry_first_refresh()
+    account = InvisiaAccount(hass, api)
+    for site in sites:
+        coordinator = InvisiaCoordinator(
+            hass=hass,
+            api=api,
+            ids=_site_ids(site),
+            capabilities=capabilities,
+            # Polled by the account scheduler, not on their own.
+            update_interval=None,
+        )
+        # One broken installation must not take the others down with it; its
+        # entities start unavailable and the scheduler keeps retrying.
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            _LOGGER.warning(
+                "Invisia installation %s / RFID %s failed its first refresh; will retry",
+                coordinator.installation_id,
+                coordinator.rfid_id,
+            )
+        account.coordinators.append(coordinator)
+
+    if not any(c.last_update_success for c in account.coordinators):
+        raise ConfigEntryNotReady("Invisia: no installation could be refreshed")
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "api": api,
-        "coordinator": coordinator,
+        "account": account,
+        "coordinators": account.coordinators,
+        "capabilities": capabilities,
         "entry": entry,
     }
 
+    entry.async_on_unload(account.async_start())
+
+    async_register_export_service(hass)
+    async_register_reprobe_service(hass)
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
@@ -56,4 +107,50 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
-    return unload_ok
\ No newline at end of file
+        if not hass.data.get(DOMAIN):
+            hass.services.async_remove(DOMAIN, SERVICE_EXPORT)
+            hass.services.async_remove(DOMAIN, SERVICE_REPROBE)
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Drop the persisted capability matrix along with the entry.
+    await InvisiaCapabilities(hass, entry.entry_id).async_remove()
+    ir.async_delete_issue(hass, DOMAIN, f"duplicate_account_{entry.entry_id}")
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    if entry.version > 3:
+        return False
+
+    if entry.version < 3:
+        # v2 entries are one (installation, RFID) pair; v3 holds a list of them.
+        data = {CONF_EMAIL: entry.data[CONF_EMAIL], CONF_PASSWORD: entry.data[CONF_PASSWORD]}
+        data[CONF_INSTALLATIONS] = [{k: entry.data[k] for k in SITE_KEYS if entry.data.get(k) is not None}]
+        email = normalize_email(entry.data[CONF_EMAIL])
+        claimed = any(
+            e.unique_id == email
+            for e in hass.config_entries.async_entries(DOMAIN)
+            if e.entry_id != entry.entry_id
+        )
+
+        if claimed:
+            # Another entry already is this account. Folding this one into it
+            # would mean moving devices/entities between entries behind the
+            # user's back, so keep it working and ask them to consolidate.
+            hass.config_entries.async_update_entry(entry, data=data, version=3)
+            ir.async_create_issue(
+                hass,
+                DOMAIN,
+                f"duplicate_account_{entry.entry_id}",
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key="duplicate_account",
+                translation_placeholders={"title": entry.title, "email": entry.data[CONF_EMAIL]},
+            )
+        else:
+            hass.config_entries.async_update_entry(entry, data=data, unique_id=email, version=3)
+
+        _LOGGER.info("Migrated Invisia entry %s to account format (v3)", entry.entry_id)
+
+    return True
@@ -0,0 +1,67 @@
+"""Account-level runtime: one login, many sites, one polling loop."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import InvisiaAPI
+from .coordinator import UPDATE_INTERVAL, InvisiaCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def normalize_email(email: str) -> str:
+    """Account key: entries with the same normalised email are one account."""
+    return email.strip().lower()
+
+
+class InvisiaAccount:
+    """Shared client and scheduler for every site of a config entry.
+
+    Site coordinators are created without their own update interval; this
+    class polls them one after another on a single timer. Adding a site adds
+    that site's data requests to the loop, not another login or session.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: InvisiaAPI) -> None:
+        self.hass = hass
+        self.api = api
+        self.coordinators: list[InvisiaCoordinator] = []
+        self._polling = False
+
+    def coordinator_for(self, installation_id: int | None, rfid_id: int | None) -> InvisiaCoordinator | None:
+        """Find a site coordinator; unset ids match anything, ambiguity matches nothing."""
+        matches = [
+            c
+            for c in self.coordinators
+            if (installation_id is None or c.ids.installation_id == installation_id)
+            and (rfid_id is None or c.ids.rfid_id == rfid_id)
+        ]
+        return matches[0] if len(matches) == 1 else None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start polling; returns the callback that stops it."""
+        return async_track_time_interval(
+            self.hass, self._async_poll, UPDATE_INTERVAL, name="Invisia account poll"
+        )
+
+    async def _async_poll(self, _now: datetime) -> None:
+        if self._polling:
+            _LOGGER.debug("Invisia poll still running; skipping this tick")
+            return
+
+        self._polling = True
+        try:
+            # Sequential on purpose: spreads requests out instead of bursting them.
+            for coordinator in self.coordinators:
+                # Like a self-scheduling coordinator: nobody listening, no polling.
+                if not coordinator.has_listeners:
+                    continue
+                await coordinator.async_refresh()
+        finally:
+            self._polling = False
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import async_timeout
 import logging
 from typing import Any
@@ -11,17 +12,43 @@ from .const import BASE_URL
 _LOGGER = logging.getLogger(__name__)
 
 
+class InvisiaApiError(RuntimeError):
+    """API call failed; `status` is the HTTP status when we got that far."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
 class InvisiaAPI:
-    """Tiny wrapper around the (unofficial) Invisia web backend."""
+    """Tiny wrapper around the (unofficial) Invisia web backend.
+
+    One instance is one login. The X-Installation-Id header is set per request,
+    so a single client can serve every installation the account has access to;
+    `installation_id` here is only the default for calls that don't pass one.
+    """
 
-    def __init__(self, email: str, password: str, installation_id: str, session):
+    def __init__(self, email: str, password: str, installation_id: str | None, session):
         self._email = email
         self._password = password
-        self._installation_id = str(installation_id)
+        self._installation_id = str(installation_id) if installation_id is not None else None
         self._session = session
 
         self._access_token: str | None = None
         self._refresh_token: str | None = None
+        # Several coordinators share this client; only one of them should log in/refresh.
+        self._auth_lock = asyncio.Lock()
+
+    def _inst(self, installation_id: int | str | None) -> str:
+        inst = installation_id if installation_id is not None else self._installation_id
+        if inst is None:
+            raise ValueError("Invisia API call needs an installation id")
+        return str(inst)
+
+    def _auth_headers(self) -> dict[str, str]:
+        if self._installation_id is None:
+            return {}
+        return {"X-Installation-Id": self._installation_id}
 
     async def login(self) -> None:
         url = f"{BASE_URL}/api/authentication/token/"
@@ -31,7 +58,7 @@ class InvisiaAPI:
             resp = await self._session.post(
                 url,
                 json=payload,
-                headers={"X-Installation-Id": self._installation_id},
+                headers=self._auth_headers(),
             )
             # If this isn't JSON, it'll explode here and that's fine: creds / backend busted.
             data = await resp.json()
@@ -60,7 +87,7 @@ class InvisiaAPI:
             resp = await self._session.post(
                 url,
                 json=payload,
-                headers={"X-Installation-Id": self._installation_id},
+                headers=self._auth_headers(),
             )
             data = await resp.json()
 
@@ -71,6 +98,19 @@ class InvisiaAPI:
         if not self._access_token:
             raise RuntimeError("Invisia token refresh failed (no access token)")
 
+    async def _ensure_token(self, stale: str | None = None) -> None:
+        """Log in (no token yet) or refresh (token `stale` was rejected), once.
+
+        Callers that queued up behind the lock find a fresh token and return.
+        """
+        async with self._auth_lock:
+            if self._access_token and self._access_token != stale:
+                return
+            if self._access_token is None:
+                await self.login()
+            else:
+                await self.refresh()
+
     async def _request(
         self,
         method: str,
@@ -79,16 +119,18 @@ class InvisiaAPI:
         params: dict[str, Any] | None = None,
         json_body: dict[str, Any] | None = None,
         allow_non_json: bool = False,
+        installation_id: int | str | None = None,
     ):
         """Perform an authenticated request. Optionally tolerate HTML/text bodies."""
         if not self._access_token:
-            await self.login()
+            await self._ensure_token()
 
+        token = self._access_token
         url = f"{BASE_URL}{path}"
         headers = {
             "Accept": "application/json",
-            "X-Authorization": f"Bearer {self._access_token}",
-            "X-Installation-Id": self._installation_id,
+            "X-Authorization": f"Bearer {token}",
+            "X-Installation-Id": self._inst(installation_id),
         }
 
         async with async_timeout.timeout(20):
@@ -103,89 +145,123 @@ class InvisiaAPI:
                 text = await resp.text()
                 if allow_non_json:
                     return {"_non_json": True, "status": resp.status, "text": text[:500]}
-                raise RuntimeError(
-                    f"Invisia API returned non-JSON for {method} {path}: {resp.status} {text[:200]}"
+                raise InvisiaApiError(
+                    f"Invisia API returned non-JSON for {method} {path}: {resp.status} {text[:200]}",
+                    resp.status,
                 )
 
         # Token invalid -> refresh/login and retry once
         if isinstance(data, dict) and data.get("code") == "token_not_valid":
-            await self.refresh()
+            await self._ensure_token(stale=token)
             return await self._request(
                 method,
                 path,
                 params=params,
                 json_body=json_body,
                 allow_non_json=allow_non_json,
+                installation_id=installation_id,
             )
 
         # Raise for non-2xx if we actually got JSON back with errors
         if resp.status >= 400 and isinstance(data, dict):
             # Keep it readable in logs.
-            raise RuntimeError(f"Invisia API error {resp.status} for {method} {path}: {data}")
+            raise InvisiaApiError(f"Invisia API error {resp.status} for {method} {path}: {data}", resp.status)
 
         return data
 
     # ---- RFID ----
-    async def get_rfid(self, rfid_id: str):
+    async def get_rfid(self, rfid_id: str, *, installation_id: int | str | None = None):
+        inst = self._inst(installation_id)
         return await self._request(
             "GET",
-            f"/api/cockpit/installations/{self._installation_id}/rfids/{rfid_id}",
+            f"/api/cockpit/installations/{inst}/rfids/{rfid_id}",
+            installation_id=inst,
         )
 
-    async def set_rfid_profile(self, rfid_id: str, profile: str):
+    async def set_rfid_profile(self, rfid_id: str, profile: str, *, installation_id: int | str | None = None):
         # profile: "instant" | "optimized" | "disabled"
+        inst = self._inst(installation_id)
         return await self._request(
             "PATCH",
-            f"/api/cockpit/installations/{self._installation_id}/rfids/{rfid_id}",
+            f"/api/cockpit/installations/{inst}/rfids/{rfid_id}",
+            installation_id=inst,
             json_body={"id": int(rfid_id), "profile": profile},
         )
 
-    async def get_rfid_journal(self, rfid_id: str, start: str, end: str):
+    async def get_rfid_journal(self, rfid_id: str, start: str, end: str, *, installation_id: int | str | None = None):
+        inst = self._inst(installation_id)
         return await self._request(
             "GET",
-            f"/api/cockpit/installations/{self._installation_id}/rfids/{rfid_id}/journal",
+            f"/api/cockpit/installations/{inst}/rfids/{rfid_id}/journal",
+            installation_id=inst,
             params={"start": start, "end": end},
             # Journal can occasionally misbehave; don't brick the whole integration.
             allow_non_json=True,
         )
 
-    async def get_rfid_timers(self, rfid_id: str):
+    async def get_rfid_timers(self, rfid_id: str, *, installation_id: int | str | None = None):
+        inst = self._inst(installation_id)
         return await self._request(
             "GET",
-            f"/api/cockpit/installations/{self._installation_id}/timers/",
+            f"/api/cockpit/installations/{inst}/timers/",
+            installation_id=inst,
             params={"object_id": rfid_id, "object_type": "rfid"},
             allow_non_json=True,
         )
 
-    async def get_rfid_stats(self, rfid_id: str, start: str, end: str, granularity: str):
+    async def get_rfid_stats(
+        self,
+        rfid_id: str,
+        start: str,
+        end: str,
+        granularity: str,
+        *,
+        installation_id: int | str | None = None,
+    ):
         # This endpoint is the flakiest. Treat it as optional upstream.
+        inst = self._inst(installation_id)
         return await self._request(
             "GET",
-            f"/api/statistics/{self._installation_id}/rfid/{rfid_id}",
+            f"/api/statistics/{inst}/rfid/{rfid_id}",
+            installation_id=inst,
             params={"start": start, "end": end, "granularity": granularity},
             allow_non_json=True,
         )
 
-    async def get_rfid_stats_zev(self, rfid_id: str, start: str, end: str, granularity: str):
+    async def get_rfid_stats_zev(
+        self,
+        rfid_id: str,
+        start: str,
+        end: str,
+        granularity: str,
+        *,
+        installation_id: int | str | None = None,
+    ):
+        inst = self._inst(installation_id)
         return await self._request(
             "GET",
-            f"/api/statistics/{self._installation_id}/rfid/{rfid_id}/zev",
+            f"/api/statistics/{inst}/rfid/{rfid_id}/zev",
+            installation_id=inst,
             params={"start": start, "end": end, "granularity": granularity},
             allow_non_json=True,
         )
 
     # ---- Charging Stations ----
-    async def get_charging_station_stats(self):
+    async def get_charging_station_stats(self, *, installation_id: int | str | None = None):
+        inst = self._inst(installation_id)
         return await self._request(
             "GET",
-            f"/api/cockpit/installations/{self._installation_id}/objects/charging_stations/stats",
+            f"/api/cockpit/installations/{inst}/objects/charging_stations/stats",
+            installation_id=inst,
             allow_non_json=True,
         )
 
-    async def get_charging_station_detail(self, charging_station_id: str):
+    async def get_charging_station_detail(self, charging_station_id: str, *, installation_id: int | str | None = None):
+        inst = self._inst(installation_id)
         return await self._request(
             "GET",
-            f"/api/cockpit/installations/{self._installation_id}/charging_stations/{charging_station_id}",
+            f"/api/cockpit/installations/{inst}/charging_stations/{charging_station_id}",
+            installation_id=inst,
             allow_non_json=True,
         )
 
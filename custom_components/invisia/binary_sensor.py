@@ -1,37 +1,52 @@
 from __future__ import annotations
 
-from homeassistant.components.binary_sensor import BinarySensorEntity
+from dataclasses import dataclass
+
+from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, CONF_INSTALLATION_ID, CONF_CHARGING_STATION_ID
+from .const import DOMAIN, ENDPOINT_CHARGING_STATION_DETAIL
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
-    data = hass.data[DOMAIN][entry.entry_id]
-    coordinator = data["coordinator"]
+@dataclass(frozen=True, kw_only=True)
+class InvisiaBinarySensorDescription(BinarySensorEntityDescription):
+    # Same idea as InvisiaSensorDescription.endpoints.
+    endpoints: frozenset[str] = frozenset()
+
 
-    installation_id = entry.data[CONF_INSTALLATION_ID]
-    cs_id = entry.data.get(CONF_CHARGING_STATION_ID)
+CAR_PLUGGED_IN = InvisiaBinarySensorDescription(
+    key="car_plugged_in",
+    name="Car plugged in",
+    endpoints=frozenset({ENDPOINT_CHARGING_STATION_DETAIL}),
+)
 
-    # If no charging station id configured, don't create entities
-    if not cs_id:
-        return
 
-    async_add_entities([InvisiaCarPluggedIn(coordinator, installation_id, cs_id)])
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    coordinators = hass.data[DOMAIN][entry.entry_id]["coordinators"]
+
+    # Sites without a charging station id configured don't get this entity
+    async_add_entities(
+        [
+            InvisiaCarPluggedIn(c, c.installation_id, c.charging_station_id)
+            for c in coordinators
+            if c.charging_station_id
+        ]
+    )
 
 
 class InvisiaCarPluggedIn(CoordinatorEntity, BinarySensorEntity):
+    entity_description: InvisiaBinarySensorDescription
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, installation_id: str, cs_id: str):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=CAR_PLUGGED_IN.endpoints)
+        self.entity_description = CAR_PLUGGED_IN
         self._installation_id = str(installation_id)
         self._cs_id = str(cs_id)
 
-        self._attr_name = "Car plugged in"
         self._attr_unique_id = f"invisia_{self._installation_id}_cs_{self._cs_id}_plugged_in"
         self._attr_suggested_object_id = f"{DOMAIN}_charging_station_{coordinator.charging_station_id}_car_plugged_in"
 
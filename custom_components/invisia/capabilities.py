@@ -0,0 +1,204 @@
+"""Per-installation capability matrix for the optional Invisia endpoints.
+
+Which of the optional endpoints (journal, stats, ...) actually work depends on
+the account and its role on an installation. Instead of hammering all of them
+on every refresh and logging the same failure forever, we probe them once,
+persist the result and skip the unsupported ones until the next (periodic or
+manual) re-probe.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import InvisiaApiError
+from .const import DOMAIN, PROBE_INTERVAL, SERVICE_REPROBE
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+SUPPORTED = "supported"
+UNSUPPORTED = "unsupported"
+# Inconclusive (timeout, 5xx, 429, odd 4xx, one-off HTML page). Not skipped by
+# the probe; refreshes still count repeated HTML answers as refusals.
+UNKNOWN = "unknown"
+
+# Statuses that mean "this account can't have this", not "try again later".
+DENIED_STATUSES = (401, 403, 404)
+
+REPROBE_SCHEMA = vol.Schema({vol.Optional("entry_id"): cv.string})
+
+
+def _is_html(result: Any) -> bool:
+    return isinstance(result, dict) and bool(result.get("_non_json"))
+
+
+def classify(result: Any = None, err: Exception | None = None) -> tuple[str, int | None]:
+    """Map an endpoint response (or the error it raised) to a capability state."""
+    if err is not None:
+        status = err.status if isinstance(err, InvisiaApiError) else None
+    elif _is_html(result):
+        status = result.get("status")
+    else:
+        return SUPPORTED, None
+
+    if status in DENIED_STATUSES:
+        return UNSUPPORTED, status
+    return UNKNOWN, status
+
+
+class InvisiaCapabilities:
+    """Persisted capability matrix, keyed by installation id."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.capabilities.{entry_id}")
+        self._data: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        self._data = await self._store.async_load() or {}
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    @property
+    def matrix(self) -> dict[str, dict[str, Any]]:
+        return self._data
+
+    def supports(self, installation_id: int | str, endpoint: str) -> bool:
+        info = self._data.get(str(installation_id), {}).get("endpoints", {}).get(endpoint)
+        return info is None or info.get("state") != UNSUPPORTED
+
+    def _last_reason(self, installation_id: int | str, endpoint: str) -> str | None:
+        info = self._data.get(str(installation_id), {}).get("endpoints", {}).get(endpoint)
+        return info.get("reason") if info else None
+
+    def needs_probe(self, installation_id: int | str) -> bool:
+        probed_at = self._data.get(str(installation_id), {}).get("probed_at")
+        if probed_at is None:
+            return True
+        probed = dt_util.parse_datetime(probed_at)
+        return probed is None or dt_util.utcnow() - probed >= timedelta(seconds=PROBE_INTERVAL)
+
+    async def async_invalidate(self, installation_id: int | str | None = None) -> None:
+        """Force a re-probe on the next refresh (persisted, so it survives a restart).
+
+        Verdicts are reset, but the last status/reason per endpoint is kept so
+        an HTML answer still counts towards the "two probes in a row" rule.
+        """
+        keys = list(self._data) if installation_id is None else [str(installation_id)]
+        for key in keys:
+            entry = self._data.get(key)
+            if entry is None:
+                continue
+            entry.pop("probed_at", None)
+            for info in entry.get("endpoints", {}).values():
+                info["state"] = UNKNOWN
+        await self._store.async_save(self._data)
+
+    async def async_probe(
+        self,
+        installation_id: int | str,
+        fetchers: dict[str, Callable[[], Awaitable[Any]]],
+    ) -> dict[str, Any]:
+        """Probe each endpoint once and persist the result.
+
+        Returns the payloads of the endpoints that worked, so the caller can use
+        them for the current refresh instead of asking again.
+        """
+        endpoints: dict[str, dict[str, Any]] = {}
+        payloads: dict[str, Any] = {}
+
+        for endpoint, fetch in fetchers.items():
+            try:
+                result = await fetch()
+            except Exception as err:  # noqa: BLE001 - anything goes with this backend
+                state, status = classify(err=err)
+                reason = str(err)[:200]
+            else:
+                state, status = classify(result)
+                reason = "html" if _is_html(result) else None
+                if state == SUPPORTED:
+                    payloads[endpoint] = result
+                elif reason == "html" and self._last_reason(installation_id, endpoint) == "html":
+                    # HTML instead of JSON on two probes in a row isn't a hiccup.
+                    state = UNSUPPORTED
+
+            endpoints[endpoint] = {"state": state, "status": status, "reason": reason}
+
+        # Merge: endpoints nobody asked for this time keep their last verdict.
+        entry = self._data.setdefault(str(installation_id), {"endpoints": {}})
+        entry["probed_at"] = dt_util.utcnow().isoformat()
+        entry["endpoints"].update(endpoints)
+        await self._store.async_save(self._data)
+
+        _LOGGER.info(
+            "Invisia installation %s capabilities: %s",
+            installation_id,
+            {name: info["state"] for name, info in endpoints.items()},
+        )
+        return payloads
+
+    async def async_mark_unsupported(self, installation_id: int | str, endpoint: str, status: int | None) -> None:
+        """An endpoint that used to work keeps refusing us; stop asking."""
+        entry = self._data.setdefault(
+            str(installation_id), {"probed_at": dt_util.utcnow().isoformat(), "endpoints": {}}
+        )
+        entry["endpoints"][endpoint] = {"state": UNSUPPORTED, "status": status, "reason": "refused during refresh"}
+        await self._store.async_save(self._data)
+        _LOGGER.info(
+            "Invisia %s is not available for installation %s (status=%s); skipping until re-probe",
+            endpoint,
+            installation_id,
+            status,
+        )
+
+
+def async_register_reprobe_service(hass: HomeAssistant) -> None:
+    if hass.services.has_service(DOMAIN, SERVICE_REPROBE):
+        return
+
+    async def _handle(call: ServiceCall) -> ServiceResponse:
+        entries = hass.data.get(DOMAIN, {})
+        entry_id = call.data.get("entry_id")
+        if entry_id is not None and entry_id not in entries:
+            raise HomeAssistantError(f"Unknown Invisia entry {entry_id}")
+
+        targets = [entries[entry_id]] if entry_id else list(entries.values())
+        for target in targets:
+            # Several sites can share an installation (and its verdicts): reset
+            # each installation once, then let the first refresh probe it.
+            by_installation: dict[int, list] = {}
+            for coordinator in target["coordinators"]:
+                by_installation.setdefault(coordinator.ids.installation_id, []).append(coordinator)
+
+            for installation_id, coordinators in by_installation.items():
+                await target["capabilities"].async_invalidate(installation_id)
+                for coordinator in coordinators:
+                    if coordinator.has_listeners:
+                        await coordinator.async_refresh()
+
+        return {
+            eid: data["capabilities"].matrix
+            for eid, data in entries.items()
+            if entry_id is None or eid == entry_id
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPROBE,
+        _handle,
+        schema=REPROBE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
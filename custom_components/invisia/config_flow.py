@@ -1,20 +1,29 @@
 from __future__ import annotations
 
+import logging
+
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .account import normalize_email
+from .api import InvisiaAPI
 from .const import (
     DOMAIN,
     CONF_EMAIL,
     CONF_PASSWORD,
     CONF_INSTALLATION_ID,
+    CONF_INSTALLATIONS,
     CONF_RFID_ID,
     CONF_USER_ID,
     CONF_CHARGING_STATION_ID,
+    SITE_KEYS,
 )
 
+_LOGGER = logging.getLogger(__name__)
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_EMAIL): str,
@@ -27,16 +36,81 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 )
 
 
+def _entry_sites(entry: config_entries.ConfigEntry) -> list[dict]:
+    """Sites of an entry, in either the account (v3) or the per-RFID (v2) layout."""
+    if CONF_INSTALLATIONS in entry.data:
+        return entry.data[CONF_INSTALLATIONS]
+    if CONF_INSTALLATION_ID in entry.data and CONF_RFID_ID in entry.data:
+        return [entry.data]
+    return []
+
+
 class InvisiaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
-    VERSION = 2
+    """One entry per account; each (installation, RFID) pair is a site in it.
+
+    Adding a site for an account that is already configured extends that
+    entry instead of creating a second login.
+    """
+
+    VERSION = 3
 
     async def async_step_user(self, user_input=None) -> FlowResult:
         if user_input is None:
             return self.async_show_form(step_id="user", data_schema=STEP_USER_DATA_SCHEMA)
 
-        unique = f"{user_input[CONF_INSTALLATION_ID]}_{user_input[CONF_RFID_ID]}"
-        await self.async_set_unique_id(unique)
-        self._abort_if_unique_id_configured()
+        site = {k: user_input[k] for k in SITE_KEYS if user_input.get(k) is not None}
+
+        # Same pair must not show up twice, whichever entry (account or legacy) has it.
+        pair = (int(site[CONF_INSTALLATION_ID]), int(site[CONF_RFID_ID]))
+        for entry in self._async_current_entries():
+            for existing in _entry_sites(entry):
+                if (int(existing[CONF_INSTALLATION_ID]), int(existing[CONF_RFID_ID])) == pair:
+                    return self.async_abort(reason="already_configured")
+
+        api = InvisiaAPI(
+            email=user_input[CONF_EMAIL],
+            password=user_input[CONF_PASSWORD],
+            installation_id=site[CONF_INSTALLATION_ID],
+            session=async_get_clientsession(self.hass),
+        )
+        try:
+            await api.login()
+        except Exception as err:  # noqa: BLE001 - login failures come in all shapes
+            _LOGGER.debug("Invisia login failed during setup", exc_info=err)
+            return self.async_show_form(
+                step_id="user",
+                data_schema=self.add_suggested_values_to_schema(STEP_USER_DATA_SCHEMA, user_input),
+                errors={"base": "auth_failed"},
+            )
+
+        email = normalize_email(user_input[CONF_EMAIL])
+        await self.async_set_unique_id(email)
+
+        # Prefer the entry that owns the account key; fall back to any entry
+        # for the same login (e.g. a migrated per-RFID entry left as duplicate).
+        # Entries still in the v2 layout (never set up since the upgrade, e.g.
+        # disabled) aren't migrated yet and can't be extended.
+        same_login = [
+            e
+            for e in self._async_current_entries()
+            if CONF_INSTALLATIONS in e.data and normalize_email(e.data.get(CONF_EMAIL, "")) == email
+        ]
+        account = next((e for e in same_login if e.unique_id == email), same_login[0] if same_login else None)
+        if account is not None:
+            data = {
+                **account.data,
+                CONF_PASSWORD: user_input[CONF_PASSWORD],
+                CONF_INSTALLATIONS: [*account.data[CONF_INSTALLATIONS], site],
+            }
+            self.hass.config_entries.async_update_entry(account, data=data)
+            await self.hass.config_entries.async_reload(account.entry_id)
+            return self.async_abort(reason="site_added")
 
-        title = f"Invisia RFID {user_input[CONF_RFID_ID]}"
-        return self.async_create_entry(title=title, data=user_input)
\ No newline at end of file
+        return self.async_create_entry(
+            title=f"Invisia {user_input[CONF_EMAIL]}",
+            data={
+                CONF_EMAIL: user_input[CONF_EMAIL],
+                CONF_PASSWORD: user_input[CONF_PASSWORD],
+                CONF_INSTALLATIONS: [site],
+            },
+        )
@@ -12,9 +12,28 @@ CONF_INSTALLATION_ID = "installation_id"
 CONF_RFID_ID = "rfid_id"
 CONF_USER_ID = "user_id"
 CONF_CHARGING_STATION_ID = "charging_station_id"
+# Account entries hold a list of sites, each a dict of the installation/RFID keys above.
+CONF_INSTALLATIONS = "installations"
+SITE_KEYS = (CONF_INSTALLATION_ID, CONF_RFID_ID, CONF_USER_ID, CONF_CHARGING_STATION_ID)
 
 BASE_URL = "https://app.invisia.ch"
 
+# Bulk exports are written below the HA config dir (i.e. /config/invisia_exports).
+SERVICE_EXPORT = "export"
+EXPORT_DIR = "invisia_exports"
+
+# Optional endpoints. Whether these work depends on the account/role, so they
+# are probed once per installation and skipped when unsupported.
+ENDPOINT_JOURNAL = "journal"
+ENDPOINT_STATS = "stats"
+ENDPOINT_TIMERS = "timers"
+ENDPOINT_CHARGING_STATION_DETAIL = "charging_station_detail"
+
+SERVICE_REPROBE = "reprobe"
+
+# Capability matrix is re-probed this often (seconds); `invisia.reprobe` forces it.
+PROBE_INTERVAL = 24 * 60 * 60
+
 # Poll interval (seconds). Coordinator uses its own scheduling; keep as simple int for now.
 SCAN_INTERVAL = 30
 
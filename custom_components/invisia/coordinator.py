@@ -1,20 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import timedelta
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
 from .api import InvisiaAPI
-from .const import DOMAIN
+from .capabilities import SUPPORTED, UNSUPPORTED, InvisiaCapabilities, classify
+from .const import (
+    DOMAIN,
+    ENDPOINT_CHARGING_STATION_DETAIL,
+    ENDPOINT_JOURNAL,
+    ENDPOINT_STATS,
+    ENDPOINT_TIMERS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 UPDATE_INTERVAL = timedelta(seconds=30)
 
+# Denials (401/403/404, or HTML instead of JSON) in a row during normal
+# refreshes before an endpoint is switched off until the next probe.
+REFUSAL_THRESHOLD = 3
+
+# How far back the journal attribute looks.
+JOURNAL_LOOKBACK = timedelta(days=7)
+
 
 @dataclass(frozen=True)
 class InvisiaIds:
@@ -32,16 +49,32 @@ class InvisiaCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         hass: HomeAssistant,
         api: InvisiaAPI,
         ids: InvisiaIds,
+        capabilities: InvisiaCapabilities,
+        update_interval: timedelta | None = UPDATE_INTERVAL,
     ) -> None:
         self.hass = hass
         self.api = api
         self.ids = ids
+        self.capabilities = capabilities
+
+        # Consecutive denials / inconclusive failures per endpoint since it last worked.
+        self._refusals: dict[str, int] = {}
+        self._failures: dict[str, int] = {}
+
+        # Endpoints fetched on the last refresh (see fetch_plan).
+        self._fetched: frozenset[str] = frozenset()
+        # Pending refresh for a newly subscribed entity (see async_add_listener).
+        self._plan_task: asyncio.Task | None = None
+
+        # The account scheduler, the debounced request refresh and plan
+        # refreshes can all land at once; one update at a time per site.
+        self._update_lock = asyncio.Lock()
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"Invisia RFID {ids.rfid_id}",
-            update_interval=UPDATE_INTERVAL,
+            update_interval=update_interval,
         )
 
     # ---------------------------------------------------------------------
@@ -99,26 +132,131 @@ class InvisiaCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     # Data refresh
     # ---------------------------------------------------------------------
 
+    @property
+    def fetch_plan(self) -> frozenset[str]:
+        """Optional endpoints some enabled entity actually reads.
+
+        Entities pass the endpoints they depend on as their coordinator
+        context, so the plan follows what is enabled and subscribed; disabled
+        entities never subscribe and cost nothing.
+        """
+        plan: set[str] = set()
+        for endpoints in self.async_contexts():
+            plan.update(endpoints)
+        return frozenset(plan)
+
+    @property
+    def has_listeners(self) -> bool:
+        """Whether any entity is subscribed (the account scheduler skips us if not)."""
+        return bool(self._listeners)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE, context: Any = None) -> Callable[[], None]:
+        remove = super().async_add_listener(update_callback, context)
+        if context and not frozenset(context) <= self._fetched and self._plan_task is None:
+            # Newly enabled entity needs data we haven't been fetching; don't
+            # leave it empty until the next poll. Not the debouncer: it drops
+            # calls made while a refresh runs. This task waits for the update
+            # lock instead, and the plan is read once it holds it, so entities
+            # subscribing in the meantime are covered by the same refresh.
+            self._plan_task = self.hass.async_create_task(self.async_refresh())
+        return remove
+
+    def _endpoint_fetchers(self) -> dict[str, Callable[[], Awaitable[Any]]]:
+        """Optional endpoints, keyed by the name used in the capability matrix."""
+        today = dt_util.now().date()
+        rfid_id = self.ids.rfid_id
+        inst = self.ids.installation_id
+
+        fetchers: dict[str, Callable[[], Awaitable[Any]]] = {
+            ENDPOINT_JOURNAL: lambda: self.api.get_rfid_journal(
+                rfid_id, (today - JOURNAL_LOOKBACK).isoformat(), today.isoformat(), installation_id=inst
+            ),
+            ENDPOINT_STATS: lambda: self.api.get_rfid_stats(
+                rfid_id, today.isoformat(), today.isoformat(), "day", installation_id=inst
+            ),
+            ENDPOINT_TIMERS: lambda: self.api.get_rfid_timers(rfid_id, installation_id=inst),
+        }
+
+        if self.charging_station_id is not None:
+            fetchers[ENDPOINT_CHARGING_STATION_DETAIL] = lambda: self.api.get_charging_station_detail(
+                self.charging_station_id, installation_id=inst
+            )
+
+        return fetchers
+
+    def _inconclusive(self, endpoint: str, what: str) -> None:
+        """Flaky, not refused: warn once per streak, keep trying quietly."""
+        count = self._failures[endpoint] = self._failures.get(endpoint, 0) + 1
+        if count == 1:
+            _LOGGER.warning("Invisia %s %s (ignored)", endpoint, what)
+        else:
+            _LOGGER.debug("Invisia %s %s (ignored, %s in a row)", endpoint, what, count)
+
+    async def _async_refused(self, endpoint: str, status: int | None) -> None:
+        """Count a denial; only a streak of them switches the endpoint off."""
+        self._refusals[endpoint] = self._refusals.get(endpoint, 0) + 1
+        if self._refusals[endpoint] < REFUSAL_THRESHOLD:
+            _LOGGER.debug("Invisia %s refused (status=%s), %s in a row", endpoint, status, self._refusals[endpoint])
+            return
+
+        del self._refusals[endpoint]
+        await self.capabilities.async_mark_unsupported(self.ids.installation_id, endpoint, status)
+
     async def _async_update_data(self) -> dict[str, Any]:
+        async with self._update_lock:
+            return await self._async_fetch()
+
+    async def _async_fetch(self) -> dict[str, Any]:
         data: dict[str, Any] = {}
 
+        plan = self.fetch_plan
+        self._fetched = plan
+        # Anyone subscribing from here on isn't covered; let them schedule anew.
+        self._plan_task = None
+
         # --- Core RFID state (THIS MUST WORK) ---
         try:
-            data.update(await self.api.get_rfid(self.ids.rfid_id))
+            data.update(await self.api.get_rfid(self.ids.rfid_id, installation_id=self.ids.installation_id))
         except Exception as err:
             _LOGGER.error("Invisia get_rfid failed", exc_info=err)
             raise
 
-        # --- Journal (best-effort) ---
-        try:
-            data["journal"] = await self.api.get_rfid_journal(self.ids.rfid_id)
-        except Exception as err:
-            _LOGGER.warning("Invisia get_journal failed (ignored)", exc_info=err)
+        fetchers = {k: v for k, v in self._endpoint_fetchers().items() if k in plan}
 
-        # --- Stats (broken server-side sometimes; ignore failures) ---
-        try:
-            data["stats"] = await self.api.get_rfid_stats(self.ids.rfid_id)
-        except Exception as err:
-            _LOGGER.warning("Invisia stats fetch failed (ignored)", exc_info=err)
+        # --- Capability probe (first run, then every PROBE_INTERVAL) ---
+        # Only what's planned gets probed. Before any entity has subscribed the
+        # plan is empty, so the probe waits for the refresh they trigger.
+        if fetchers and self.capabilities.needs_probe(self.ids.installation_id):
+            data.update(await self.capabilities.async_probe(self.ids.installation_id, fetchers))
+            # Every endpoint was just tried once; don't ask twice in one cycle.
+            fetchers = {}
+
+        # --- Optional endpoints (best-effort, unsupported ones are skipped) ---
+        for endpoint, fetch in fetchers.items():
+            if not self.capabilities.supports(self.ids.installation_id, endpoint):
+                continue
+
+            try:
+                result = await fetch()
+            except Exception as err:
+                state, status = classify(err=err)
+                if state == UNSUPPORTED:
+                    await self._async_refused(endpoint, status)
+                else:
+                    self._inconclusive(endpoint, f"fetch failed: {err}")
+                continue
+
+            state, status = classify(result)
+            if state == SUPPORTED:
+                self._refusals.pop(endpoint, None)
+                self._failures.pop(endpoint, None)
+                data[endpoint] = result
+            elif state == UNSUPPORTED or (status is not None and status < 500):
+                # A denial, or HTML with a non-error status (typically the login
+                # page): the backend saying "no" rather than "not now".
+                await self._async_refused(endpoint, status)
+            else:
+                self._inconclusive(endpoint, f"returned non-JSON (status={status})")
 
-        return data
\ No newline at end of file
+        return data
@@ -0,0 +1,419 @@
+"""Bulk export of RFID journal / ZEV statistics to CSV or Parquet.
+
+Pages through a date range in fixed windows, fetches a handful of windows
+concurrently (within a request budget) and streams each window to disk as soon
+as it is in. A small progress file next to the output makes an interrupted
+export resumable: the next call with the same parameters picks up at the first
+window that was not written yet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN, EXPORT_DIR, SERVICE_EXPORT
+
+_LOGGER = logging.getLogger(__name__)
+
+DATASET_JOURNAL = "journal"
+DATASET_STATS_ZEV = "stats_zev"
+DATASETS = [DATASET_JOURNAL, DATASET_STATS_ZEV]
+
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+FORMATS = [FORMAT_CSV, FORMAT_PARQUET]
+
+# Columns every exported row starts with; everything else comes from the payload.
+WINDOW_COLUMNS = ["window_start", "window_end"]
+# Keys that show up after the header was written land here as JSON.
+EXTRA_COLUMN = "extra"
+
+EXPORT_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): cv.string,
+        vol.Optional("installation_id"): vol.Coerce(int),
+        vol.Optional("rfid_id"): vol.Coerce(int),
+        vol.Required("dataset"): vol.In(DATASETS),
+        vol.Required("start"): cv.date,
+        vol.Required("end"): cv.date,
+        vol.Optional("window_days", default=7): vol.All(vol.Coerce(int), vol.Range(min=1, max=366)),
+        vol.Optional("granularity", default="day"): cv.string,
+        vol.Optional("format", default=FORMAT_CSV): vol.In(FORMATS),
+        vol.Optional("filename"): cv.string,
+        vol.Optional("resume", default=True): cv.boolean,
+        vol.Optional("max_concurrency", default=2): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+        vol.Optional("requests_per_minute", default=30): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+    }
+)
+
+
+@dataclass(frozen=True)
+class ExportJob:
+    dataset: str
+    installation_id: int
+    rfid_id: int
+    start: date
+    end: date
+    window_days: int
+    granularity: str
+    fmt: str
+
+    def windows(self) -> list[tuple[date, date]]:
+        """Split [start, end] (both inclusive) into fixed windows."""
+        out: list[tuple[date, date]] = []
+        cur = self.start
+        step = timedelta(days=self.window_days)
+        while cur <= self.end:
+            w_end = min(cur + step - timedelta(days=1), self.end)
+            out.append((cur, w_end))
+            cur = w_end + timedelta(days=1)
+        return out
+
+    def fingerprint(self) -> dict[str, Any]:
+        """What a progress file must match before we dare to resume from it."""
+        return {
+            "dataset": self.dataset,
+            "installation_id": self.installation_id,
+            "rfid_id": self.rfid_id,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "window_days": self.window_days,
+            "granularity": self.granularity,
+            "format": self.fmt,
+        }
+
+
+class _RateLimiter:
+    """Spaces request starts evenly so we never exceed N requests per minute."""
+
+    def __init__(self, per_minute: int) -> None:
+        self._interval = 60.0 / per_minute
+        self._lock = asyncio.Lock()
+        self._next = 0.0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            wait = self._next - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next = loop.time() + self._interval
+
+
+# -------------------------------------------------------------------------
+# Payload -> rows
+# -------------------------------------------------------------------------
+
+
+def _flatten(obj: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    for key, val in obj.items():
+        name = f"{prefix}{key}"
+        if isinstance(val, dict):
+            out.update(_flatten(val, f"{name}."))
+        elif isinstance(val, list):
+            # Nested lists don't map onto columns; keep them intact as JSON.
+            out[name] = json.dumps(val, default=str)
+        else:
+            out[name] = val
+    return out
+
+
+def _payload_rows(payload: Any) -> list[dict[str, Any]]:
+    if isinstance(payload, list):
+        items = payload
+    elif isinstance(payload, dict):
+        # Paginated-ish shapes first, otherwise the dict itself is the row.
+        items = next(
+            (payload[k] for k in ("results", "data", "items") if isinstance(payload.get(k), list)),
+            [payload],
+        )
+    else:
+        items = []
+
+    return [_flatten(i) if isinstance(i, dict) else {"value": i} for i in items]
+
+
+def _fit_rows(fieldnames: list[str], rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Squeeze rows into a fixed header; unknown keys go to the extra column."""
+    known = set(fieldnames)
+    out = []
+    for row in rows:
+        fitted = {k: v for k, v in row.items() if k in known}
+        extra = {k: v for k, v in row.items() if k not in known}
+        if extra:
+            fitted[EXTRA_COLUMN] = json.dumps(extra, default=str)
+        out.append(fitted)
+    return out
+
+
+# -------------------------------------------------------------------------
+# Sinks (all methods are blocking; call them from the executor)
+# -------------------------------------------------------------------------
+
+
+class _CsvSink:
+    """Single CSV file, appended window by window."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def check(self) -> None:
+        pass
+
+    def reset(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    def write(self, index: int, fieldnames: list[str], rows: list[dict[str, Any]], offset: int | None) -> int:
+        """Append rows and return the new byte offset.
+
+        On resume the file is first cut back to the last recorded offset, so a
+        window that was half-written when we got interrupted is dropped and
+        written again instead of being duplicated.
+        """
+        fresh = offset is None or not self.path.exists()
+        with open(self.path, "w" if fresh else "r+", newline="", encoding="utf-8") as fh:
+            if not fresh:
+                fh.seek(offset)
+                fh.truncate()
+            writer = csv.DictWriter(fh, fieldnames=fieldnames)
+            if fresh:
+                writer.writeheader()
+            writer.writerows(rows)
+            fh.flush()
+            os.fsync(fh.fileno())
+            return fh.tell()
+
+
+class _ParquetSink:
+    """Directory of part files, one per window (Parquet can't be appended to)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def check(self) -> None:
+        """Fail before any request is spent if pyarrow isn't there."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as err:
+            raise HomeAssistantError("Parquet export requires the pyarrow package") from err
+
+    def reset(self) -> None:
+        if self.path.is_dir():
+            for part in self.path.glob("part-*.parquet"):
+                part.unlink()
+
+    def write(self, index: int, fieldnames: list[str], rows: list[dict[str, Any]], offset: int | None) -> int:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Payload types vary between windows; strings keep the schema stable.
+        columns = {
+            name: pa.array([None if r.get(name) is None else str(r[name]) for r in rows], type=pa.string())
+            for name in fieldnames
+        }
+        pq.write_table(pa.table(columns), self.path / f"part-{index:05d}.parquet")
+        return 0
+
+
+# -------------------------------------------------------------------------
+# Export
+# -------------------------------------------------------------------------
+
+
+def _progress_path(out: Path) -> Path:
+    return out.with_name(f"{out.name}.progress.json")
+
+
+def _load_progress(path: Path) -> dict[str, Any] | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        _LOGGER.warning("Invisia export progress file %s is unreadable; starting over", path)
+        return None
+
+
+def _save_progress(path: Path, progress: dict[str, Any]) -> None:
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(json.dumps(progress), encoding="utf-8")
+    tmp.replace(path)
+
+
+async def _fetch_window(api, job: ExportJob, limiter: _RateLimiter, w_start: date, w_end: date) -> list[dict[str, Any]]:
+    await limiter.acquire()
+    start, end = w_start.isoformat(), w_end.isoformat()
+
+    try:
+        if job.dataset == DATASET_JOURNAL:
+            payload = await api.get_rfid_journal(job.rfid_id, start, end, installation_id=job.installation_id)
+        else:
+            payload = await api.get_rfid_stats_zev(
+                job.rfid_id, start, end, job.granularity, installation_id=job.installation_id
+            )
+    except Exception as err:
+        raise HomeAssistantError(f"Invisia {job.dataset} failed for {start}..{end}: {err}") from err
+
+    # Skipping a window would leave a silent hole in a billing export, so stop
+    # here instead; the progress file lets the next run retry this window.
+    if isinstance(payload, dict) and payload.get("_non_json"):
+        raise HomeAssistantError(
+            f"Invisia {job.dataset} returned non-JSON for {start}..{end} (status={payload.get('status')})"
+        )
+
+    # Same for a paginated answer: only the first page came back. The API
+    # wrapper can't follow `next`, so make the user shrink the window instead.
+    if isinstance(payload, dict) and payload.get("next"):
+        raise HomeAssistantError(
+            f"Invisia {job.dataset} for {start}..{end} spans several pages "
+            f"({payload.get('count', '?')} records); use a smaller window_days"
+        )
+
+    return [{"window_start": start, "window_end": end, **row} for row in _payload_rows(payload)]
+
+
+async def async_export(
+    hass: HomeAssistant,
+    api,
+    job: ExportJob,
+    out: Path,
+    *,
+    resume: bool = True,
+    max_concurrency: int = 2,
+    requests_per_minute: int = 30,
+) -> dict[str, Any]:
+    """Run an export job; returns a small summary."""
+    sink = _CsvSink(out) if job.fmt == FORMAT_CSV else _ParquetSink(out)
+    progress_file = _progress_path(out)
+    windows = job.windows()
+
+    await hass.async_add_executor_job(sink.check)
+
+    progress = await hass.async_add_executor_job(_load_progress, progress_file)
+    if progress and progress.get("job") != job.fingerprint():
+        if resume:
+            raise HomeAssistantError(
+                f"{out.name} has an unfinished export with different parameters; "
+                "pick another filename or call again with resume: false"
+            )
+        progress = None
+
+    if not resume or progress is None:
+        await hass.async_add_executor_job(out.parent.mkdir, 0o755, True, True)
+        await hass.async_add_executor_job(sink.reset)
+        progress = {"job": job.fingerprint(), "next_window": 0, "fieldnames": None, "offset": None, "rows": 0}
+    elif progress["next_window"]:
+        _LOGGER.info("Resuming Invisia export %s at window %s/%s", out, progress["next_window"], len(windows))
+
+    limiter = _RateLimiter(requests_per_minute)
+    next_window = progress["next_window"]
+
+    # Fetch up to max_concurrency windows at once but write them strictly in
+    # order, so at most one batch of rows is ever held in memory.
+    while next_window < len(windows):
+        batch = windows[next_window : next_window + max_concurrency]
+        results = await asyncio.gather(
+            *(_fetch_window(api, job, limiter, w_start, w_end) for w_start, w_end in batch),
+            return_exceptions=True,
+        )
+
+        # Keep whatever came in before the first failure; those requests are
+        # already paid for. The failed window is retried on resume.
+        for rows in results:
+            if isinstance(rows, BaseException):
+                raise rows
+            if rows:
+                if progress["fieldnames"] is None:
+                    keys = dict.fromkeys(k for row in rows for k in row)
+                    progress["fieldnames"] = [*keys, EXTRA_COLUMN]
+                fitted = _fit_rows(progress["fieldnames"], rows)
+                progress["offset"] = await hass.async_add_executor_job(
+                    sink.write, next_window, progress["fieldnames"], fitted, progress["offset"]
+                )
+                progress["rows"] += len(rows)
+
+            next_window += 1
+            progress["next_window"] = next_window
+            await hass.async_add_executor_job(_save_progress, progress_file, progress)
+
+    await hass.async_add_executor_job(progress_file.unlink, True)
+
+    return {"path": str(out), "windows": len(windows), "rows": progress["rows"]}
+
+
+def _resolve_output(hass: HomeAssistant, job: ExportJob, filename: str | None) -> Path:
+    base = Path(hass.config.path(EXPORT_DIR)).resolve()
+    if not filename:
+        filename = f"{job.dataset}_{job.installation_id}_{job.rfid_id}_{job.start}_{job.end}.{job.fmt}"
+
+    out = (base / filename).resolve()
+    if not out.is_relative_to(base):
+        raise HomeAssistantError(f"Export filename must stay inside {base}")
+    return out
+
+
+def async_register_export_service(hass: HomeAssistant) -> None:
+    if hass.services.has_service(DOMAIN, SERVICE_EXPORT):
+        return
+
+    async def _handle(call: ServiceCall) -> ServiceResponse:
+        entries = hass.data.get(DOMAIN, {})
+        entry_id = call.data.get("entry_id")
+        if entry_id is None and len(entries) == 1:
+            entry_id = next(iter(entries))
+        if entry_id not in entries:
+            raise HomeAssistantError("Specify the entry_id of the Invisia entry to export from")
+
+        coordinator = entries[entry_id]["account"].coordinator_for(
+            call.data.get("installation_id"), call.data.get("rfid_id")
+        )
+        if coordinator is None:
+            raise HomeAssistantError("Specify installation_id / rfid_id of a single configured site")
+        if call.data["end"] < call.data["start"]:
+            raise HomeAssistantError("Export end date is before start date")
+
+        job = ExportJob(
+            dataset=call.data["dataset"],
+            installation_id=coordinator.ids.installation_id,
+            rfid_id=coordinator.ids.rfid_id,
+            start=call.data["start"],
+            end=call.data["end"],
+            window_days=call.data["window_days"],
+            granularity=call.data["granularity"],
+            fmt=call.data["format"],
+        )
+        out = _resolve_output(hass, job, call.data.get("filename"))
+
+        return await async_export(
+            hass,
+            entries[entry_id]["api"],
+            job,
+            out,
+            resume=call.data["resume"],
+            max_concurrency=call.data["max_concurrency"],
+            requests_per_minute=call.data["requests_per_minute"],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        _handle,
+        schema=EXPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -1,30 +1,46 @@
 from __future__ import annotations
 
-from homeassistant.components.select import SelectEntity
+from dataclasses import dataclass
+
+from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, ENDPOINT_CHARGING_STATION_DETAIL
 from .coordinator import InvisiaCoordinator
 
 OPTIONS = ["instant", "optimized", "disabled"]
 
 
+@dataclass(frozen=True, kw_only=True)
+class InvisiaSelectDescription(SelectEntityDescription):
+    # Same idea as InvisiaSensorDescription.endpoints.
+    endpoints: frozenset[str] = frozenset()
+
+
+CHARGING_MODE = InvisiaSelectDescription(
+    key="charging_mode",
+    name="Charging Mode",
+    icon="mdi:ev-station",
+    options=OPTIONS,
+    endpoints=frozenset({ENDPOINT_CHARGING_STATION_DETAIL}),
+)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities: AddEntitiesCallback) -> None:
-    coordinator: InvisiaCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    async_add_entities([InvisiaChargingModeSelect(coordinator, entry.entry_id)])
+    coordinators: list[InvisiaCoordinator] = hass.data[DOMAIN][entry.entry_id]["coordinators"]
+    async_add_entities([InvisiaChargingModeSelect(c, entry.entry_id) for c in coordinators])
 
 
 class InvisiaChargingModeSelect(CoordinatorEntity[InvisiaCoordinator], SelectEntity):
+    entity_description: InvisiaSelectDescription
     _attr_has_entity_name = True
-    _attr_name = "Charging Mode"
-    _attr_icon = "mdi:ev-station"
-    _attr_options = OPTIONS
 
     def __init__(self, coordinator: InvisiaCoordinator, entry_id: str) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=CHARGING_MODE.endpoints)
+        self.entity_description = CHARGING_MODE
         self._attr_unique_id = f"{DOMAIN}_{coordinator.installation_id}_{coordinator.rfid_id}_charging_mode"
         # Keep entity_ids sane (avoid 'select.charging_mode', etc.)
         self._attr_suggested_object_id = f"invisia_{coordinator.rfid_id}_charging_mode"
@@ -58,5 +74,7 @@ class InvisiaChargingModeSelect(CoordinatorEntity[InvisiaCoordinator], SelectEnt
         option = option.lower()
         if option not in OPTIONS:
             return
-        await self.coordinator.api.set_rfid_profile(self.coordinator.ids.rfid_id, option)
+        await self.coordinator.api.set_rfid_profile(
+            self.coordinator.ids.rfid_id, option, installation_id=self.coordinator.ids.installation_id
+        )
         await self.coordinator.async_request_refresh()
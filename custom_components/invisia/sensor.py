@@ -11,7 +11,13 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import DeviceInfo
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    ENDPOINT_CHARGING_STATION_DETAIL,
+    ENDPOINT_JOURNAL,
+    ENDPOINT_STATS,
+    ENDPOINT_TIMERS,
+)
 from .coordinator import InvisiaCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,6 +26,8 @@ _LOGGER = logging.getLogger(__name__)
 @dataclass(frozen=True, kw_only=True)
 class InvisiaSensorDescription(SensorEntityDescription):
     keypath: str
+    # Optional endpoints this sensor reads; only fetched while it is enabled.
+    endpoints: frozenset[str] = frozenset()
 
 
 SENSORS: tuple[InvisiaSensorDescription, ...] = (
@@ -36,6 +44,7 @@ SENSORS: tuple[InvisiaSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         suggested_display_precision=2,
         keypath="stats.current_power_flow",
+        endpoints=frozenset({ENDPOINT_STATS}),
     ),
     InvisiaSensorDescription(
         key="rfid_energy_charged",
@@ -44,12 +53,17 @@ SENSORS: tuple[InvisiaSensorDescription, ...] = (
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         suggested_display_precision=3,
         keypath="stats.e_charged",
+        endpoints=frozenset({ENDPOINT_STATS}),
     ),
     InvisiaSensorDescription(
         key="rfid_status",
         name="Status",
         icon="mdi:ev-station",
         keypath="status.charging_status",
+        # State prefers the station detail; attributes pull in the rest.
+        endpoints=frozenset(
+            {ENDPOINT_CHARGING_STATION_DETAIL, ENDPOINT_STATS, ENDPOINT_JOURNAL, ENDPOINT_TIMERS}
+        ),
     ),
 )
 
@@ -64,15 +78,15 @@ def _get_path(data: dict[str, Any], path: str) -> Any:
 
 
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities: AddEntitiesCallback) -> None:
-    coordinator: InvisiaCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    async_add_entities([InvisiaSensor(coordinator, entry.entry_id, d) for d in SENSORS])
+    coordinators: list[InvisiaCoordinator] = hass.data[DOMAIN][entry.entry_id]["coordinators"]
+    async_add_entities([InvisiaSensor(c, entry.entry_id, d) for c in coordinators for d in SENSORS])
 
 
 class InvisiaSensor(CoordinatorEntity[InvisiaCoordinator], SensorEntity):
     entity_description: InvisiaSensorDescription
 
     def __init__(self, coordinator: InvisiaCoordinator, entry_id: str, description: InvisiaSensorDescription) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=description.endpoints)
         self.entity_description = description
         self._attr_unique_id = f"{DOMAIN}_{coordinator.installation_id}_{coordinator.rfid_id}_{description.key}"
         self._attr_suggested_object_id = f"{DOMAIN}_rfid_{coordinator.rfid_id}_{description.key}"